@@ -1,10 +1,20 @@
 import streamlit as st
 import requests
+import orjson
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
 from datetime import datetime
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Dict, List, Set, Tuple
 from pathlib import Path
 import os
+import csv
+import threading
+import time
 from dotenv import load_dotenv
 import urllib3
 
@@ -13,8 +23,18 @@ load_dotenv()
 
 # Constants
 API_BASE_URL = "http://api.quotable.io"  # Changed from https to http
-QUOTES_FILE = "quotes.csv"
+QUOTES_FILE = "quotes.parquet"
+QUOTES_LOG_FILE = "quotes.csv"  # Append log, compacted into QUOTES_FILE
+COMPACT_LOG_BYTES = 64 * 1024
+QUOTE_COLUMNS = ['quote', 'author', 'date_saved']
+CACHE_NAME = ".quotable_cache"
+AUTHORS_CACHE_FILE = ".authors_cache.parquet"
+AUTHORS_CACHE_MAX_AGE = 86400  # Refresh the author snapshot once a day
+STALE_MESSAGE = "Showing cached copy"
 TIMEOUT_SECONDS = 5
+REQUESTS_PER_MINUTE = 180
+REQUEST_BURST = 10  # Requests allowed back to back before throttling
+MAX_SEARCH_PAGES = 5
 CATEGORIES = [
     "happiness", "inspirational", "life", "love", 
     "philosophy", "success", "wisdom"
@@ -35,119 +55,409 @@ st.markdown("Discover and save inspiring quotes!", unsafe_allow_html=True)
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+class TokenBucket:
+    """Token bucket rate limiter shared by all API calls"""
+
+    def __init__(self, rpm: int, capacity: int = REQUEST_BURST):
+        self.rpm = rpm
+        self.capacity = capacity
+        self.request_tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Block until the requested number of tokens is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self.last_refill
+                self.request_tokens = min(
+                    self.capacity,
+                    self.request_tokens + elapsed * self.rpm / 60
+                )
+                self.last_refill = now
+                if self.request_tokens >= tokens:
+                    self.request_tokens -= tokens
+                    return
+                wait = (tokens - self.request_tokens) * 60 / self.rpm
+            time.sleep(wait)
+
+@st.cache_resource
+def get_rate_limiter() -> TokenBucket:
+    """One token bucket per process, shared by every session and rerun"""
+    return TokenBucket(rpm=REQUESTS_PER_MINUTE)
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTP adapter that takes a token before each request that reaches the network
+
+    Cache hits are answered by requests-cache without calling the adapter,
+    so they don't use up tokens.
+    """
+
+    def __init__(self, limiter: TokenBucket, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.limiter.acquire(1)
+        return super().send(request, **kwargs)
+
+@st.cache_resource
+def get_session() -> requests_cache.CachedSession:
+    """Build the shared HTTP session once per process
+
+    Repeated API calls reuse its pooled keep-alive connections across reruns,
+    and responses are cached on disk so they survive app restarts.
+    """
+    session = requests_cache.CachedSession(
+        cache_name=CACHE_NAME,
+        backend='sqlite',
+        expire_after=3600,
+        allowable_methods=('GET',),
+        urls_expire_after={
+            '*/authors': 86400,
+            '*/quotes': 600,
+            '*/random': 0  # Never cache random quotes
+        }
+    )
+    session.headers.update({'Accept-Encoding': 'gzip', 'Accept': 'application/json'})
+    adapter = RateLimitedAdapter(
+        get_rate_limiter(),
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def rate_limited_get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared session, whose adapter enforces the API rate limit"""
+    return get_session().get(url, **kwargs)
+
+@st.cache_resource
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """Background workers for prefetching API calls, shared per process"""
+    return ThreadPoolExecutor(max_workers=2)
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a JSON body with orjson
+
+    Bad bodies raise requests' JSONDecodeError, a RequestException, just
+    like response.json() did, so the existing error handlers still apply.
+    """
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+def _get_stale_json(url: str, params: Optional[Dict] = None,
+                    verify: bool = False) -> Optional[Dict]:
+    """Decode the last cached response for a request, ignoring its expiry
+
+    verify is part of the requests-cache key, so it must match the fetch.
+    """
+    try:
+        session = get_session()
+        request = session.prepare_request(requests.Request('GET', url, params=params))
+        stale = session.cache.get_response(session.cache.create_key(request, verify=verify))
+        return _decode_json(stale) if stale is not None else None
+    except Exception:
+        return None
+
 @st.cache_data(ttl=3600)
 def get_random_quote() -> Optional[Dict]:
     """Fetch a random quote from the Quotable API"""
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/random",
-            timeout=TIMEOUT_SECONDS,
-            verify=False  # Disable SSL verification
-        )
-        response.raise_for_status()
-        return response.json()
+        return _fetch_random_quote()
     except requests.RequestException as e:
+        # Random quotes are never cached, so there is no stale copy to fall back to
         st.error(f"Error fetching quote: {str(e)}")
         return None
 
+def _fetch_random_quote() -> Dict:
+    """Fetch a random quote, raising on API errors"""
+    response = rate_limited_get(
+        f"{API_BASE_URL}/random",
+        timeout=TIMEOUT_SECONDS,
+        verify=False  # Disable SSL verification
+    )
+    response.raise_for_status()
+    return _decode_json(response)
+
 @st.cache_data(ttl=3600)
 def get_authors() -> List[str]:
-    """Fetch list of authors from the API"""
+    """Fetch list of authors, preferring the on-disk snapshot"""
+    cached = _load_authors_cache()
+    if cached is not None:
+        names, age = cached
+        if age >= AUTHORS_CACHE_MAX_AGE:
+            # Serve the old snapshot now and refresh it in the background
+            get_prefetch_executor().submit(_refresh_authors_cache)
+        return names
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/authors",
+        return _fetch_authors()
+    except requests.RequestException as e:
+        stale = _get_stale_json(f"{API_BASE_URL}/authors")
+        if stale is not None:
+            st.info(STALE_MESSAGE)
+            return [author['name'] for author in stale['results']]
+        st.error(f"Error fetching authors: {str(e)}")
+        return []
+
+def _fetch_authors() -> List[str]:
+    """Fetch author names from the API and snapshot them to disk"""
+    response = rate_limited_get(
+        f"{API_BASE_URL}/authors",
+        timeout=TIMEOUT_SECONDS,
+        verify=False
+    )
+    response.raise_for_status()
+    names = [author['name'] for author in _decode_json(response)['results']]
+    _save_authors_cache(names)
+    return names
+
+def _refresh_authors_cache() -> None:
+    """Background refresh of the author snapshot"""
+    try:
+        _fetch_authors()
+    except requests.RequestException:
+        pass  # Keep the old snapshot until the API is back
+
+def _save_authors_cache(names: List[str]) -> None:
+    """Snapshot the author list to disk"""
+    try:
+        pd.DataFrame({'name': names}).to_parquet(AUTHORS_CACHE_FILE, engine='pyarrow', index=False)
+    except (OSError, ValueError):
+        pass
+
+def _authors_cache_age() -> Optional[float]:
+    """Age of the author snapshot in seconds, or None if there isn't one"""
+    try:
+        return time.time() - os.path.getmtime(AUTHORS_CACHE_FILE)
+    except OSError:
+        return None
+
+def _load_authors_cache() -> Optional[Tuple[List[str], float]]:
+    """Load the author snapshot and its age in seconds, if there is one"""
+    age = _authors_cache_age()
+    if age is None:
+        return None
+    try:
+        names = pd.read_parquet(AUTHORS_CACHE_FILE, engine='pyarrow', columns=['name'])['name'].tolist()
+        return names, age
+    except (OSError, ValueError):
+        return None
+
+def _fetch_quotes_page(params: Dict, path: str = "/quotes") -> Dict:
+    """Fetch a single page of quotes, falling back to a stale cached copy"""
+    url = f"{API_BASE_URL}{path}"
+    try:
+        response = rate_limited_get(
+            url,
+            params=params,
             timeout=TIMEOUT_SECONDS,
             verify=False
         )
         response.raise_for_status()
-        return [author['name'] for author in response.json()['results']]
-    except requests.RequestException as e:
-        st.error(f"Error fetching authors: {str(e)}")
-        return []
+        return _decode_json(response)
+    except requests.RequestException:
+        stale = _get_stale_json(url, params)
+        if stale is None:
+            raise
+        return {**stale, 'stale': True}
+
+def _filter_by_content(quotes: List[Dict], query: str) -> List[Dict]:
+    """Keep quotes whose content contains the query (case-insensitive)"""
+    if not query:
+        return quotes
+    query_lc = query.lower()
+    return [quote for quote in quotes if query_lc in quote['content'].lower()]
 
-@st.cache_data(ttl=3600)
 def search_quotes(query: str = "", author: str = None) -> Dict:
     """Search quotes by content and/or author"""
     try:
-        all_results = []
-        page = 1
-        total_pages = 1
+        return _search_quotes_cached(query, author)
+    except requests.RequestException as e:
+        st.error(f"Error searching quotes: {str(e)}")
+        return {"count": 0, "results": [], "error": True}
+
+@st.cache_data(ttl=3600)
+def _search_quotes_cached(query: str, author: Optional[str]) -> Dict:
+    """Search quotes, raising on API errors so failures are never cached"""
+    author_filter = author if author and author != "All Authors" else None
+    
+    # Content searches are done server-side in a single request
+    if query:
+        params = {
+            'query': query,
+            'limit': 50
+        }
+        if author_filter:
+            params['author'] = author_filter
         
-        # If searching content with All Authors, fetch multiple pages
-        while page <= total_pages and (page <= 5 or author != "All Authors"):
-            params = {
-                'limit': 50,
-                'maxLength': 1000,
-                'page': page
-            }
-            
-            # Add author filter if specified
-            if author and author != "All Authors":
-                params['author'] = author
-                
-            response = requests.get(
-                f"{API_BASE_URL}/quotes",
-                params=params,
-                timeout=TIMEOUT_SECONDS,
-                verify=False
-            )
-            response.raise_for_status()
-            results = response.json()
-            
-            all_results.extend(results['results'])
-            total_pages = results.get('totalPages', 1)
-            page += 1
+        results = _fetch_quotes_page(params, path="/search/quotes")
+        if results.get('stale', False):
+            st.info(STALE_MESSAGE)
         
-        # Client-side content filtering
-        if query:
+        # The API matches words loosely and author isn't a documented
+        # search parameter, so re-check both on the returned page
+        filtered_results = _filter_by_content(results['results'], query)
+        if author_filter:
             filtered_results = [
-                quote for quote in all_results
-                if query.lower() in quote['content'].lower()
+                quote for quote in filtered_results
+                if quote['author'] == author_filter
             ]
-            # Don't limit results when searching all authors with content
-            if author and author != "All Authors":
-                filtered_results = filtered_results[:10]
-            
-            return {
-                'count': len(filtered_results),
-                'results': filtered_results
-            }
-        else:
-            # If no content search, just return the first page results
-            return {
-                'count': len(all_results),
-                'results': all_results[:10] if author and author != "All Authors" else all_results
-            }
-            
-    except requests.RequestException as e:
-        st.error(f"Error searching quotes: {str(e)}")
-        return {"count": 0, "results": []}
+        filtered_results = filtered_results[:10]
+        return {
+            'count': len(filtered_results),
+            'results': filtered_results
+        }
+    
+    params = {
+        'limit': 50,
+        'maxLength': 1000,
+        'page': 1
+    }
+    
+    # Add author filter if specified
+    if author_filter:
+        params['author'] = author_filter
+    
+    # First page tells us how many pages there are
+    results = _fetch_quotes_page(params)
+    all_results = list(results['results'])
+    is_stale = results.get('stale', False)
+    total_pages = results.get('totalPages', 1)
+    
+    # Cap the number of pages. An author listing only shows the first 10
+    # quotes, which page 1 already covers, so skip the rest entirely.
+    total_pages = 1 if author_filter else min(total_pages, MAX_SEARCH_PAGES)
+    
+    # Fetch the remaining pages concurrently, keeping page order
+    remaining = range(2, total_pages + 1)
+    if remaining:
+        def fetch_page(page: int) -> Dict:
+            try:
+                return _fetch_quotes_page({**params, 'page': page})
+            except requests.RequestException:
+                return {'results': []}  # Keep whatever the other pages returned
+        
+        with ThreadPoolExecutor(max_workers=MAX_SEARCH_PAGES) as executor:
+            for page_data in executor.map(fetch_page, remaining):
+                all_results.extend(page_data['results'])
+                is_stale = is_stale or page_data.get('stale', False)
+    
+    if is_stale:
+        st.info(STALE_MESSAGE)
+    
+    return {
+        'count': len(all_results),
+        'results': all_results[:10] if author_filter else all_results
+    }
 
 @st.cache_data(ttl=60)  # Cache for 1 minute
 def load_saved_quotes() -> pd.DataFrame:
-    """Load saved quotes from CSV file"""
+    """Load saved quotes from disk"""
     try:
-        return pd.read_csv(QUOTES_FILE)
+        return _read_saved_quotes()
     except FileNotFoundError:
-        return pd.DataFrame(columns=['quote', 'author', 'date_saved'])
+        return pd.DataFrame(columns=QUOTE_COLUMNS)
     except Exception as e:
         st.error(f"Error loading quotes: {str(e)}")
-        return pd.DataFrame(columns=['quote', 'author', 'date_saved'])
+        return pd.DataFrame(columns=QUOTE_COLUMNS)
+
+@st.cache_resource
+def get_saved_quotes_lock() -> threading.RLock:
+    """Lock shared by every session that reads or writes the saved quotes files"""
+    return threading.RLock()
+
+def _read_saved_quotes() -> pd.DataFrame:
+    """Read the Parquet store plus any rows still waiting in the append log"""
+    with get_saved_quotes_lock():
+        return _read_saved_quote_files()
+
+def _read_saved_quote_files() -> pd.DataFrame:
+    """Read both saved quotes files; callers hold the saved quotes lock"""
+    frames = []
+    if Path(QUOTES_FILE).exists():
+        frames.append(pd.read_parquet(QUOTES_FILE, engine='pyarrow', columns=QUOTE_COLUMNS))
+    if Path(QUOTES_LOG_FILE).exists():
+        # Arrow's multi-threaded CSV reader; keep every column as text like pandas did
+        table = pacsv.read_csv(
+            QUOTES_LOG_FILE,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(
+                column_types={column: pa.string() for column in QUOTE_COLUMNS}
+            )
+        )
+        frames.append(table.to_pandas())
+    if not frames:
+        return pd.DataFrame(columns=QUOTE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+def _compact_saved_quotes() -> None:
+    """Fold the append log into the Parquet store and remove the log"""
+    with get_saved_quotes_lock():
+        df = _read_saved_quote_files()
+        # Write to a temp file first so a failed write never truncates the store
+        tmp_file = f"{QUOTES_FILE}.tmp"
+        try:
+            df.to_parquet(tmp_file, engine='pyarrow', index=False)
+            os.replace(tmp_file, QUOTES_FILE)
+        finally:
+            Path(tmp_file).unlink(missing_ok=True)
+        Path(QUOTES_LOG_FILE).unlink(missing_ok=True)
+
+def _append_saved_quote(quote: str, author: str) -> None:
+    """Append one row to the log, compacting it into Parquet when due"""
+    with get_saved_quotes_lock():
+        # Append a single row instead of rewriting the whole file
+        write_header = not Path(QUOTES_LOG_FILE).exists()
+        with open(QUOTES_LOG_FILE, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(QUOTE_COLUMNS)
+            writer.writerow([quote, author, datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+        # Migrate a legacy CSV on first save, then compact once the log grows
+        if (not Path(QUOTES_FILE).exists()
+                or os.path.getsize(QUOTES_LOG_FILE) > COMPACT_LOG_BYTES):
+            try:
+                _compact_saved_quotes()
+            except Exception:
+                pass  # The row is safe in the log; the next save retries compaction
+
+def _saved_quotes_signature() -> Tuple:
+    """Paths and modification times of the saved quotes files"""
+    return tuple(
+        (path, os.path.getmtime(path) if Path(path).exists() else None)
+        for path in (QUOTES_FILE, QUOTES_LOG_FILE)
+    )
+
+def _refresh_saved_keys() -> Set[Tuple[str, str]]:
+    """Return the (quote, author) keys of saved quotes, reloading only if the files changed"""
+    signature = _saved_quotes_signature()
+    saved_keys = st.session_state.get('saved_keys')
+    if saved_keys is None or st.session_state.get('saved_mtime') != signature:
+        load_saved_quotes.clear()  # Files changed on disk, drop the stale copy
+        df = load_saved_quotes()
+        saved_keys = set(zip(df['quote'], df['author']))
+        st.session_state['saved_keys'] = saved_keys
+        st.session_state['saved_mtime'] = signature
+    return saved_keys
 
 def save_quote(quote: str, author: str) -> bool:
-    """Save a quote to CSV file"""
+    """Save a quote to the saved quotes store"""
     try:
-        df = load_saved_quotes()
+        saved_keys = _refresh_saved_keys()
         # Check for duplicates
-        if df[(df['quote'] == quote) & (df['author'] == author)].empty:
-            new_quote = pd.DataFrame({
-                'quote': [quote],
-                'author': [author],
-                'date_saved': [datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
-            })
-            df = pd.concat([df, new_quote], ignore_index=True)
-            df.to_csv(QUOTES_FILE, index=False)
-            st.cache_data.clear()  # Clear cache to refresh saved quotes
+        if (quote, author) not in saved_keys:
+            _append_saved_quote(quote, author)
+            # Update the key set in place and only drop the saved list cache,
+            # leaving the API caches untouched
+            saved_keys.add((quote, author))
+            st.session_state['saved_mtime'] = _saved_quotes_signature()
+            load_saved_quotes.clear()
             return True
         else:
             st.warning("This quote is already saved!")
@@ -156,7 +466,7 @@ def save_quote(quote: str, author: str) -> bool:
         st.error(f"Error saving quote: {str(e)}")
         return False
 
-def display_quote(quote_data: Dict, key_suffix: str) -> None:
+def display_quote(quote_data: Dict, key_suffix: str, saved_keys: Set[Tuple[str, str]]) -> None:
     """Display a quote with consistent formatting"""
     st.markdown(f"### _{quote_data['content']}_")
     st.markdown(f"**— {quote_data['author']}**")
@@ -165,9 +475,7 @@ def display_quote(quote_data: Dict, key_suffix: str) -> None:
     save_container = st.container()
     
     # Check if quote is already saved
-    df = load_saved_quotes()
-    is_saved = not df[(df['quote'] == quote_data['content']) & 
-                     (df['author'] == quote_data['author'])].empty
+    is_saved = (quote_data['content'], quote_data['author']) in saved_keys
     
     with save_container:
         if not is_saved:
@@ -178,23 +486,76 @@ def display_quote(quote_data: Dict, key_suffix: str) -> None:
         else:
             st.success("Quote already saved!")
 
+def _start_prefetch() -> None:
+    """Fetch authors and the first "Get New Quote" result in the background, once per session
+
+    Worker threads have no script context, so they run the raw fetchers,
+    which raise instead of writing UI messages.
+    """
+    if 'prefetch' not in st.session_state:
+        executor = get_prefetch_executor()
+        prefetch = {'quote': executor.submit(_fetch_random_quote)}
+        age = _authors_cache_age()
+        if age is None or age >= AUTHORS_CACHE_MAX_AGE:
+            prefetch['authors'] = executor.submit(_fetch_authors)
+        st.session_state.prefetch = prefetch
+
+def _take_prefetched(name: str, fetch: Callable[[], Any]) -> Any:
+    """Use a background result the first time it is needed, then call fetch as usual
+
+    If the background call failed, fetch runs in the script thread so its
+    error is shown to the user.
+    """
+    future = st.session_state.get('prefetch', {}).pop(name, None)
+    if future is not None:
+        try:
+            return future.result()
+        except requests.RequestException:
+            pass
+    return fetch()
+
+def _update_search_results(submitted: bool, search_query: str, selected_author: str) -> None:
+    """Search only when Search is clicked; other reruns repaint the stored results
+
+    Repeat searches are served by the search_quotes cache. Failures are not
+    cached or stored, so the error shows once and the search can be retried.
+    """
+    if not submitted:
+        return
+    search_results = search_quotes(query=search_query, author=selected_author)
+    if search_results.get('error'):
+        # Don't repaint a failure as "no quotes found" on later reruns
+        st.session_state.pop('search_results', None)
+        st.session_state.pop('last_query', None)
+    else:
+        st.session_state.search_results = search_results
+        st.session_state.last_query = (search_query, selected_author)
+
 def main():
     # Initialize session state for current quote
     if 'current_quote' not in st.session_state:
         st.session_state.current_quote = None
 
+    # Fire independent API calls concurrently so tabs are ready when clicked
+    _start_prefetch()
+
+    # Load saved quotes once per run for the "already saved?" checks
+    saved_keys = _refresh_saved_keys()
+
     # Create tabs
     tab1, tab2, tab3 = st.tabs(["Daily Quote", "Search Quotes", "Saved Quotes"])
     
     # Tab 1: Daily Quote
     with tab1:
+        # The first click uses the quote prefetched at session start
         if st.button("Get New Quote", key="random_quote"):
-            st.session_state.current_quote = get_random_quote()
+            st.session_state.current_quote = _take_prefetched('quote', get_random_quote)
         
         if st.session_state.current_quote:
             display_quote(
                 st.session_state.current_quote,
-                f"daily_{str(st.session_state.current_quote['_id'])}"
+                f"daily_{str(st.session_state.current_quote['_id'])}",
+                saved_keys
             )
 
     # Tab 2: Search Quotes
@@ -211,20 +572,23 @@ def main():
             )
         
         with col2:
-            authors = ["All Authors"] + get_authors()
+            authors = ["All Authors"] + _take_prefetched('authors', get_authors)
             selected_author = st.selectbox(
                 "Filter by author:",
                 options=authors,
                 index=0
             )
         
-        # Search button to trigger the search
-        if st.button("Search", key="search_button") or search_query or selected_author != "All Authors":
-            # Get search results
-            search_results = search_quotes(
-                query=search_query,
-                author=selected_author
-            )
+        _update_search_results(
+            st.button("Search", key="search_button"),
+            search_query,
+            selected_author
+        )
+        
+        if 'search_results' in st.session_state:
+            # Describe the results using the inputs that produced them
+            search_query, selected_author = st.session_state.last_query
+            search_results = st.session_state.search_results
             quotes = search_results.get('results', [])
             
             if quotes:
@@ -243,7 +607,7 @@ def main():
                 
                 # Display quotes
                 for quote in quotes:
-                    display_quote(quote, f"search_{quote['_id']}")
+                    display_quote(quote, f"search_{quote['_id']}", saved_keys)
             else:
                 st.info("No quotes found matching your criteria.")
     
@@ -251,10 +615,14 @@ def main():
     with tab3:
         saved_quotes = load_saved_quotes()
         if not saved_quotes.empty:
-            for _, row in saved_quotes.iterrows():
-                st.markdown(f"### _{row['quote']}_")
-                st.markdown(f"**— {row['author']}**")
-                st.caption(f"Saved on: {row['date_saved']}")
+            for quote, author, date_saved in zip(
+                saved_quotes['quote'].values,
+                saved_quotes['author'].values,
+                saved_quotes['date_saved'].values
+            ):
+                st.markdown(f"### _{quote}_")
+                st.markdown(f"**— {author}**")
+                st.caption(f"Saved on: {date_saved}")
                 st.divider()
         else:
             st.info("No saved quotes yet. Start saving some quotes!")
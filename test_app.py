@@ -1,17 +1,39 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from pathlib import Path
+from unittest.mock import patch, MagicMock, PropertyMock
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import os
+import time
+import io
 from app import (
     get_random_quote,
     get_authors,
     search_quotes,
     load_saved_quotes,
-    save_quote
+    save_quote,
+    _read_saved_quotes,
+    TokenBucket,
+    get_session,
+    API_BASE_URL,
+    STALE_MESSAGE,
+    _take_prefetched,
+    rate_limited_get,
+    _refresh_authors_cache,
+    AUTHORS_CACHE_MAX_AGE,
+    MAX_SEARCH_PAGES,
+    TIMEOUT_SECONDS,
+    _compact_saved_quotes,
+    _refresh_saved_keys,
+    _start_prefetch,
+    _fetch_random_quote,
+    _update_search_results
 )
 import requests
+from concurrent.futures import Future
+from urllib3.response import HTTPResponse
+import streamlit as st
 
 # Test data
 MOCK_QUOTE = {
@@ -45,6 +67,13 @@ MOCK_SEARCH_RESULTS = {
     ]
 }
 
+@pytest.fixture(autouse=True)
+def clear_cached_data():
+    """Start each test with empty st.cache_data caches and session state"""
+    st.cache_data.clear()
+    st.session_state.clear()
+    yield
+
 @pytest.fixture
 def mock_csv_file(tmp_path):
     """Create a temporary CSV file for testing"""
@@ -57,6 +86,27 @@ def mock_csv_file(tmp_path):
     df.to_csv(csv_path, index=False)
     return csv_path
 
+@pytest.fixture
+def mock_quotes_store(mock_csv_file, tmp_path):
+    """Point the saved quotes store at a temporary append log and Parquet file"""
+    with patch('app.QUOTES_LOG_FILE', str(mock_csv_file)), \
+         patch('app.QUOTES_FILE', str(tmp_path / "test_quotes.parquet")):
+        yield
+
+@pytest.fixture(autouse=True)
+def http_cache_file(tmp_path):
+    """Keep the requests-cache database out of the working directory"""
+    with patch('app.CACHE_NAME', str(tmp_path / "quotable_cache")):
+        get_session.clear()
+        yield
+    get_session.clear()
+
+@pytest.fixture(autouse=True)
+def authors_cache_file(tmp_path):
+    """Keep the on-disk author snapshot out of the working directory"""
+    with patch('app.AUTHORS_CACHE_FILE', str(tmp_path / "authors_cache.parquet")):
+        yield
+
 @pytest.fixture
 def mock_response():
     """Create a mock response object"""
@@ -66,9 +116,9 @@ def mock_response():
 
 def test_get_random_quote(mock_response):
     """Test getting a random quote"""
-    mock_response.json.return_value = MOCK_QUOTE
+    mock_response.content = json.dumps(MOCK_QUOTE).encode()
     
-    with patch('requests.get', return_value=mock_response):
+    with patch('app.rate_limited_get', return_value=mock_response):
         quote = get_random_quote()
         assert quote == MOCK_QUOTE
         assert quote['content'] == "Test quote content"
@@ -76,18 +126,18 @@ def test_get_random_quote(mock_response):
 
 def test_get_authors(mock_response):
     """Test getting authors list"""
-    mock_response.json.return_value = MOCK_AUTHORS
+    mock_response.content = json.dumps(MOCK_AUTHORS).encode()
     
-    with patch('requests.get', return_value=mock_response):
+    with patch('app.rate_limited_get', return_value=mock_response):
         authors = get_authors()
         assert len(authors) == 2
         assert authors == ["Author 1", "Author 2"]
 
 def test_search_quotes_content_filter(mock_response):
     """Test searching quotes with content filter"""
-    mock_response.json.return_value = MOCK_SEARCH_RESULTS
+    mock_response.content = json.dumps(MOCK_SEARCH_RESULTS).encode()
     
-    with patch('requests.get', return_value=mock_response):
+    with patch('app.rate_limited_get', return_value=mock_response):
         results = search_quotes(query="experience", author="All Authors")
         filtered_quotes = results['results']
         assert len(filtered_quotes) == 1
@@ -113,50 +163,88 @@ def test_search_quotes_author_filter(mock_response):
         ]
     }
     
-    mock_response.json.return_value = author_results
+    mock_response.content = json.dumps(author_results).encode()
     
-    with patch('requests.get', return_value=mock_response):
+    with patch('app.rate_limited_get', return_value=mock_response):
         results = search_quotes(author="Author 1")
         assert len(results['results']) <= 10
         assert len(results['results']) > 0  # Make sure we got some results
         assert all(quote['author'] == "Author 1" for quote in results['results'])
 
-def test_load_saved_quotes(mock_csv_file):
+def test_load_saved_quotes(mock_quotes_store):
     """Test loading saved quotes"""
-    with patch('app.QUOTES_FILE', str(mock_csv_file)):
-        df = load_saved_quotes()
-        assert len(df) == 1
-        assert df.iloc[0]['quote'] == 'Test quote'
-        assert df.iloc[0]['author'] == 'Test Author'
+    df = load_saved_quotes()
+    assert len(df) == 1
+    assert df.iloc[0]['quote'] == 'Test quote'
+    assert df.iloc[0]['author'] == 'Test Author'
 
-def test_save_quote(mock_csv_file):
+def test_save_quote(mock_quotes_store, mock_csv_file):
     """Test saving a new quote"""
-    with patch('app.QUOTES_FILE', str(mock_csv_file)):
-        result = save_quote("New quote", "New Author")
-        assert result == True
-        
-        # Verify the quote was saved
-        df = pd.read_csv(mock_csv_file)
-        assert len(df) == 2
-        assert df.iloc[1]['quote'] == 'New quote'
-        assert df.iloc[1]['author'] == 'New Author'
+    result = save_quote("New quote", "New Author")
+    assert result == True
+    
+    # Verify the quote was saved and the legacy CSV migrated to Parquet
+    df = _read_saved_quotes()
+    assert len(df) == 2
+    assert df.iloc[1]['quote'] == 'New quote'
+    assert df.iloc[1]['author'] == 'New Author'
+    assert not mock_csv_file.exists()
 
-def test_save_duplicate_quote(mock_csv_file):
+def test_save_duplicate_quote(mock_quotes_store):
     """Test saving a duplicate quote"""
-    with patch('app.QUOTES_FILE', str(mock_csv_file)):
-        # Try to save the same quote that's already in the test CSV
-        result = save_quote("Test quote", "Test Author")
-        assert result == False
-        
-        # Verify no duplicate was added
-        df = pd.read_csv(mock_csv_file)
-        assert len(df) == 1
+    # Try to save the same quote that's already in the test CSV
+    result = save_quote("Test quote", "Test Author")
+    assert result == False
+    
+    # Verify no duplicate was added
+    df = _read_saved_quotes()
+    assert len(df) == 1
+
+def network_response(request, payload):
+    """Build a real JSON response for a prepared request"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = request.url
+    response.headers['Content-Type'] = 'application/json'
+    response._content = json.dumps(payload).encode()
+    response.raw = HTTPResponse(
+        body=io.BytesIO(response._content),
+        headers=response.headers,
+        status=200,
+        preload_content=False,
+        request_url=request.url
+    )
+    response.request = request
+    return response
+
+def cache_response(url, payload):
+    """Fill the shared session's cache through a real fetch with a mocked network"""
+    with patch('requests.adapters.HTTPAdapter.send',
+               side_effect=lambda request, **kwargs: network_response(request, payload)):
+        response = rate_limited_get(url, timeout=TIMEOUT_SECONDS, verify=False)
+    assert not response.from_cache
+
+def test_stale_response_served_when_api_fails():
+    """Test that an expired cached response is served with a banner when the API is down"""
+    cache_response(f"{API_BASE_URL}/authors", MOCK_AUTHORS)
+    get_session().cache.reset_expiration(datetime.utcnow() - timedelta(days=1))
+    
+    with patch('requests.adapters.HTTPAdapter.send',
+               side_effect=requests.ConnectionError("API down")) as mock_send, \
+         patch('app.st.info') as mock_info, \
+         patch('app.st.error') as mock_error:
+        authors = get_authors()
+        assert mock_send.called  # The expired entry forced a real request
+        assert authors == ["Author 1", "Author 2"]
+        mock_info.assert_called_once_with(STALE_MESSAGE)
+        mock_error.assert_not_called()
 
 def test_api_error_handling(mock_response):
     """Test API error handling"""
     mock_response.raise_for_status.side_effect = requests.RequestException("API Error")
     
-    with patch('requests.get', return_value=mock_response):
+    with patch('app.rate_limited_get', return_value=mock_response), \
+         patch('app._get_stale_json', return_value=None):
         quote = get_random_quote()
         assert quote is None
         
@@ -189,9 +277,328 @@ def test_search_quotes_pagination(mock_response):
         ]
     }
     
-    mock_response.json.side_effect = [first_page, second_page]
+    type(mock_response).content = PropertyMock(
+        side_effect=[json.dumps(first_page).encode(), json.dumps(second_page).encode()]
+    )
     
-    with patch('requests.get', return_value=mock_response):
+    with patch('app.rate_limited_get', return_value=mock_response) as mock_get:
         results = search_quotes(author="Author 1")
         assert len(results['results']) <= 10
-        assert all(quote['author'] == "Author 1" for quote in results['results']) 
\ No newline at end of file
+        assert all(quote['author'] == "Author 1" for quote in results['results'])
+        # Page 1 already covers the 10 quotes shown for an author
+        assert mock_get.call_count == 1
+
+def test_search_quotes_caps_pages():
+    """Test that listing all authors fetches at most MAX_SEARCH_PAGES pages"""
+    def fake_get(url, params=None, **kwargs):
+        response = MagicMock()
+        response.content = json.dumps({
+            "totalPages": 20,
+            "results": [{"_id": str(params['page']), "content": "Quote", "author": "Author 1"}]
+        }).encode()
+        return response
+    
+    with patch('app.rate_limited_get', side_effect=fake_get) as mock_get:
+        results = search_quotes(author="All Authors")
+        assert mock_get.call_count == MAX_SEARCH_PAGES
+        expected = [str(page) for page in range(1, MAX_SEARCH_PAGES + 1)]
+        assert [quote['_id'] for quote in results['results']] == expected
+
+def test_search_quotes_partial_pages():
+    """Test that a failing later page keeps results from the other pages"""
+    first_page = {
+        "count": 4,
+        "totalPages": 2,
+        "results": [
+            {"_id": "1", "content": "Quote 1", "author": "Author 1"},
+            {"_id": "2", "content": "Quote 2", "author": "Author 1"}
+        ]
+    }
+    
+    def fake_get(url, params=None, **kwargs):
+        response = MagicMock()
+        if params['page'] == 1:
+            response.content = json.dumps(first_page).encode()
+        else:
+            response.raise_for_status.side_effect = requests.RequestException("API Error")
+        return response
+    
+    with patch('app.rate_limited_get', side_effect=fake_get):
+        results = search_quotes(author="All Authors")
+        assert [quote['_id'] for quote in results['results']] == ["1", "2"]
+
+def test_search_quotes_uses_search_endpoint(mock_response):
+    """Test that content searches go to the server-side search endpoint"""
+    mock_response.content = json.dumps(MOCK_SEARCH_RESULTS).encode()
+    
+    with patch('app.rate_limited_get', return_value=mock_response) as mock_get:
+        results = search_quotes(query="second quote", author="Author 1")
+        assert mock_get.call_count == 1
+        assert mock_get.call_args[0][0].endswith("/search/quotes")
+        assert mock_get.call_args[1]['params']['author'] == "Author 1"
+        assert [quote['_id'] for quote in results['results']] == ["2"]
+        assert set(results['results'][0]) == {"_id", "content", "author"}
+
+def test_search_quotes_filters_author_client_side(mock_response):
+    """Test that content searches drop quotes by other authors"""
+    mixed_results = {
+        "count": 2,
+        "results": [
+            {"_id": "1", "content": "Wisdom begins in wonder", "author": "Author 1"},
+            {"_id": "2", "content": "Wisdom is the daughter of experience", "author": "Author 2"}
+        ]
+    }
+    mock_response.content = json.dumps(mixed_results).encode()
+    
+    with patch('app.rate_limited_get', return_value=mock_response):
+        results = search_quotes(query="wisdom", author="Author 2")
+        assert [quote['_id'] for quote in results['results']] == ["2"]
+
+def test_take_prefetched_falls_back_on_error():
+    """Test that a failed background fetch is retried in the script thread"""
+    future = Future()
+    future.set_exception(requests.ConnectionError("API down"))
+    st.session_state.prefetch = {'authors': future}
+    fetch = MagicMock(return_value=["Author 1"])
+    try:
+        assert _take_prefetched('authors', fetch) == ["Author 1"]
+        fetch.assert_called_once()
+        assert 'authors' not in st.session_state.prefetch
+    finally:
+        del st.session_state.prefetch
+
+def test_token_bucket_waits_when_empty():
+    """Test that the rate limiter sleeps once the bucket is drained"""
+    clock = [0.0]
+    
+    def fake_sleep(seconds):
+        clock[0] += seconds
+    
+    with patch('app.time.monotonic', side_effect=lambda: clock[0]), \
+         patch('app.time.sleep', side_effect=fake_sleep) as mock_sleep:
+        bucket = TokenBucket(rpm=2, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+        assert mock_sleep.call_count == 0
+        
+        bucket.acquire()
+        assert mock_sleep.call_count == 1
+        assert clock[0] == pytest.approx(30.0)
+
+def test_rate_limiter_charges_only_network_sends():
+    """Test that cache hits don't take tokens but real sends do"""
+    url = f"{API_BASE_URL}/authors"
+    cache_response(url, MOCK_AUTHORS)
+    adapter = get_session().get_adapter(url)
+    
+    with patch.object(adapter, 'limiter') as mock_limiter:
+        response = rate_limited_get(url, timeout=TIMEOUT_SECONDS, verify=False)
+        assert response.from_cache
+        mock_limiter.acquire.assert_not_called()
+        
+        with patch('requests.adapters.HTTPAdapter.send', return_value=MagicMock()):
+            adapter.send(requests.Request('GET', url).prepare())
+        mock_limiter.acquire.assert_called_once_with(1)
+
+
+def write_authors_snapshot(path, names, age):
+    """Write an author snapshot that looks `age` seconds old"""
+    pd.DataFrame({'name': names}).to_parquet(path, index=False)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+def test_get_authors_fresh_snapshot_skips_api(tmp_path):
+    """Test that a recent author snapshot is used without any HTTP call"""
+    snapshot = tmp_path / "authors_cache.parquet"
+    write_authors_snapshot(snapshot, ["Snapshot Author"], age=60)
+    
+    with patch('app.AUTHORS_CACHE_FILE', str(snapshot)), \
+         patch('app.rate_limited_get') as mock_get, \
+         patch('app.get_prefetch_executor') as mock_executor:
+        assert get_authors() == ["Snapshot Author"]
+        assert mock_get.call_count == 0
+        mock_executor.return_value.submit.assert_not_called()
+
+def test_get_authors_old_snapshot_refreshes_in_background(tmp_path):
+    """Test that an old snapshot is served while a refresh is submitted"""
+    snapshot = tmp_path / "authors_cache.parquet"
+    write_authors_snapshot(snapshot, ["Snapshot Author"], age=AUTHORS_CACHE_MAX_AGE + 60)
+    
+    with patch('app.AUTHORS_CACHE_FILE', str(snapshot)), \
+         patch('app.rate_limited_get') as mock_get, \
+         patch('app.get_prefetch_executor') as mock_executor:
+        assert get_authors() == ["Snapshot Author"]
+        assert mock_get.call_count == 0
+        mock_executor.return_value.submit.assert_called_once_with(_refresh_authors_cache)
+
+def test_get_authors_corrupt_snapshot_uses_api(tmp_path, mock_response):
+    """Test that an unreadable snapshot falls back to the API and is rewritten"""
+    snapshot = tmp_path / "authors_cache.parquet"
+    snapshot.write_bytes(b"not a parquet file")
+    mock_response.content = json.dumps(MOCK_AUTHORS).encode()
+    
+    with patch('app.AUTHORS_CACHE_FILE', str(snapshot)), \
+         patch('app.rate_limited_get', return_value=mock_response) as mock_get:
+        assert get_authors() == ["Author 1", "Author 2"]
+        assert mock_get.call_count == 1
+    assert pd.read_parquet(snapshot)['name'].tolist() == ["Author 1", "Author 2"]
+
+def test_get_authors_missing_snapshot_uses_api(mock_response):
+    """Test that without a snapshot the author list comes from the API"""
+    mock_response.content = json.dumps(MOCK_AUTHORS).encode()
+    
+    with patch('app.rate_limited_get', return_value=mock_response) as mock_get:
+        assert get_authors() == ["Author 1", "Author 2"]
+        assert mock_get.call_count == 1
+
+
+def test_save_quote_compacts_large_log(mock_quotes_store, mock_csv_file, tmp_path):
+    """Test that the log is folded into Parquet once it passes the size threshold"""
+    save_quote("First quote", "Author 1")  # Migrates the legacy CSV
+    save_quote("Second quote", "Author 2")
+    assert mock_csv_file.exists()  # Small log, not compacted yet
+    
+    with patch('app.COMPACT_LOG_BYTES', 0):
+        assert save_quote("Third quote", "Author 3") == True
+    assert not mock_csv_file.exists()
+    df = pd.read_parquet(tmp_path / "test_quotes.parquet")
+    assert df['quote'].tolist() == ['Test quote', 'First quote', 'Second quote', 'Third quote']
+
+def test_save_quote_survives_failed_compaction(mock_quotes_store, mock_csv_file):
+    """Test that a save still succeeds and keeps the row if compaction fails"""
+    with patch('app._compact_saved_quotes', side_effect=OSError("disk full")):
+        assert save_quote("New quote", "New Author") == True
+    assert pd.read_csv(mock_csv_file)['quote'].tolist() == ['Test quote', 'New quote']
+
+def test_failed_compaction_keeps_parquet_store(mock_quotes_store, mock_csv_file, tmp_path):
+    """Test that a write that dies halfway doesn't truncate quotes.parquet"""
+    save_quote("First quote", "Author 1")  # Migrates the legacy CSV
+    save_quote("Second quote", "Author 2")
+    
+    def broken_write(df, path, **kwargs):
+        Path(path).write_bytes(b"PAR1 truncated")
+        raise OSError("disk full")
+    
+    with patch('pandas.DataFrame.to_parquet', autospec=True, side_effect=broken_write):
+        with pytest.raises(OSError):
+            _compact_saved_quotes()
+    
+    assert pd.read_parquet(tmp_path / "test_quotes.parquet")['quote'].tolist() == ['Test quote', 'First quote']
+    assert _read_saved_quotes()['quote'].tolist() == ['Test quote', 'First quote', 'Second quote']
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_refresh_saved_keys_skips_reload_when_unchanged(mock_quotes_store):
+    """Test that unchanged files reuse the key set without reading them again"""
+    with patch('app._read_saved_quotes', wraps=_read_saved_quotes) as mock_read:
+        keys = _refresh_saved_keys()
+        assert keys == {('Test quote', 'Test Author')}
+        assert _refresh_saved_keys() is keys
+        assert mock_read.call_count == 1
+
+def test_refresh_saved_keys_reloads_on_mtime_change(mock_quotes_store, mock_csv_file):
+    """Test that a file changed on disk (e.g. by another session) is reloaded"""
+    keys = _refresh_saved_keys()
+    with open(mock_csv_file, 'a', newline='') as f:
+        f.write("Other quote,Other Author,2024-01-01 00:00:00\n")
+    mtime = os.path.getmtime(mock_csv_file) + 10
+    os.utime(mock_csv_file, (mtime, mtime))
+    
+    with patch('app._read_saved_quotes', wraps=_read_saved_quotes) as mock_read:
+        reloaded = _refresh_saved_keys()
+        assert mock_read.call_count == 1
+    assert reloaded is not keys
+    assert ('Other quote', 'Other Author') in reloaded
+
+def test_save_quote_updates_saved_keys_in_place(mock_quotes_store):
+    """Test that a save adds its key to the session set without a reload"""
+    keys = _refresh_saved_keys()
+    assert save_quote("New quote", "New Author") == True
+    assert ('New quote', 'New Author') in keys
+    
+    with patch('app._read_saved_quotes', wraps=_read_saved_quotes) as mock_read:
+        assert _refresh_saved_keys() is keys
+        assert mock_read.call_count == 0
+
+
+def test_start_prefetch_skips_fresh_author_snapshot(tmp_path):
+    """Test that a fresh snapshot isn't refetched and isn't read just to check it"""
+    snapshot = tmp_path / "authors_cache.parquet"
+    write_authors_snapshot(snapshot, ["Snapshot Author"], age=60)
+    
+    with patch('app.AUTHORS_CACHE_FILE', str(snapshot)), \
+         patch('app.get_prefetch_executor') as mock_executor, \
+         patch('app.pd.read_parquet') as mock_read:
+        _start_prefetch()
+        assert set(st.session_state.prefetch) == {'quote'}
+        mock_read.assert_not_called()
+        assert mock_executor.return_value.submit.call_count == 1
+
+def test_start_prefetch_fetches_missing_author_snapshot():
+    """Test that authors are prefetched when there is no snapshot"""
+    with patch('app.get_prefetch_executor') as mock_executor:
+        _start_prefetch()
+        assert set(st.session_state.prefetch) == {'quote', 'authors'}
+        assert mock_executor.return_value.submit.call_count == 2
+
+
+def test_malformed_json_is_handled(mock_response):
+    """Test that a non-JSON body is reported like any other API error"""
+    mock_response.content = b"<html>down</html>"
+    
+    with patch('app.rate_limited_get', return_value=mock_response), \
+         patch('app.st.error') as mock_error:
+        assert get_random_quote() is None
+        assert get_authors() == []
+        assert search_quotes("x") == {"count": 0, "results": [], "error": True}
+        assert search_quotes(author="Author 1")['count'] == 0
+        assert mock_error.call_count == 4
+        
+        with pytest.raises(requests.RequestException):
+            _fetch_random_quote()
+
+
+def test_search_runs_only_on_click():
+    """Test that reruns without a Search click repaint the stored results"""
+    found = {"count": 1, "results": [MOCK_QUOTE]}
+    with patch('app.search_quotes', return_value=found) as mock_search:
+        _update_search_results(False, "test", "All Authors")
+        mock_search.assert_not_called()
+        assert 'search_results' not in st.session_state
+        
+        _update_search_results(True, "test", "All Authors")
+        mock_search.assert_called_once_with(query="test", author="All Authors")
+        assert st.session_state.search_results == found
+        assert st.session_state.last_query == ("test", "All Authors")
+        
+        # Typing or other widget reruns keep painting the last results
+        _update_search_results(False, "other", "Author 1")
+        assert mock_search.call_count == 1
+        assert st.session_state.search_results == found
+        assert st.session_state.last_query == ("test", "All Authors")
+        
+        # The same search can be repeated
+        _update_search_results(True, "test", "All Authors")
+        assert mock_search.call_count == 2
+
+def test_failed_search_is_not_stored():
+    """Test that an errored search isn't repainted later as an empty result"""
+    found = {"count": 1, "results": [MOCK_QUOTE]}
+    failed = {"count": 0, "results": [], "error": True}
+    with patch('app.search_quotes', side_effect=[found, failed]):
+        _update_search_results(True, "test", "All Authors")
+        _update_search_results(True, "test", "Author 1")
+    assert 'search_results' not in st.session_state
+    assert 'last_query' not in st.session_state
+
+def test_failed_search_is_retried(mock_response):
+    """Test that failures aren't cached, so retrying reaches the API"""
+    mock_response.content = json.dumps(MOCK_SEARCH_RESULTS).encode()
+    
+    with patch('app.rate_limited_get',
+               side_effect=[requests.ConnectionError("API down"), mock_response]) as mock_get, \
+         patch('app._get_stale_json', return_value=None):
+        assert search_quotes("experience")['error'] == True
+        results = search_quotes("experience")
+        assert mock_get.call_count == 2
+        assert [quote['_id'] for quote in results['results']] == ["1"]